@@ -8,12 +8,14 @@
 """Community submission request."""
 
 from flask_babelex import lazy_gettext as _
-from invenio_records_resources.services.uow import RecordCommitOp, RecordIndexOp
+from invenio_records_resources.services.uow import RecordCommitOp
 from invenio_requests.customizations import actions
 
 from ..proxies import current_rdm_records_service as service
+from ..services.components.file_exploration import validate_github_url
 from .base import ReviewRequest
-import os
+from .uow import ParentCommitDraftIndexOp
+
 
 #
 # Actions
@@ -25,6 +27,9 @@ class SubmitAction(actions.SubmitAction):
         """Execute the submit action."""
         draft = self.request.topic.resolve()
         service._validate_draft(identity, draft)
+        # MSD-LIVE CHANGE the github url is not checked by the schema, check it here
+        # so an unreachable url is caught on submit instead of when the curator accepts
+        validate_github_url(draft.metadata)
         # Set the record's title as the request title.
         self.request["title"] = draft.metadata["title"]
         super().execute(identity, uow)
@@ -65,11 +70,14 @@ class AcceptAction(actions.AcceptAction):
             # no longer have to skip since we are no longer storing community with msdlive_projects
             # ?but maybe instead I'll need to add the community TO the msdlive_projects in order for UI
             # of published records still work?
-            for project in projects:
-                if project.get('id') != str(community.id):
-                    draft.parent.communities.add(
-                        project.get('id'), request=None, default=False
-                    )
+            # skip projects without an id and add a project listed more than once
+            # only once, keeping the order the projects were selected in
+            for project_id in dict.fromkeys(p.get('id') for p in projects):
+                if project_id is None or project_id == str(community.id):
+                    continue
+                draft.parent.communities.add(
+                    project_id, request=None, default=False
+                )
         else:
             projects = []
         # also add the selected parent community to the list of msdlive_projects
@@ -108,9 +116,8 @@ class DeclineAction(actions.DeclineAction):
         # in the review systemfield, the review should be set with the updated
         # request object
         draft.parent.review = self.request
-        uow.register(RecordCommitOp(draft.parent))
-        # update draft to reflect the new status
-        uow.register(RecordIndexOp(draft, indexer=service.indexer))
+        # commit the parent and update draft to reflect the new status
+        uow.register(ParentCommitDraftIndexOp(draft, indexer=service.indexer))
 
 
 class CancelAction(actions.CancelAction):
@@ -145,9 +152,8 @@ class CancelAction(actions.CancelAction):
         # in the review systemfield, the review should be set with the updated
         # request object
         draft.parent.review = self.request
-        uow.register(RecordCommitOp(draft.parent))
-        # update draft to reflect the new status
-        uow.register(RecordIndexOp(draft, indexer=service.indexer))
+        # commit the parent and update draft to reflect the new status
+        uow.register(ParentCommitDraftIndexOp(draft, indexer=service.indexer))
 
         # MSD-LIVE CHANGE END
 
@@ -168,9 +174,8 @@ class ExpireAction(actions.CancelAction):
         # in the review systemfield, the review should be set with the updated
         # request object
         draft.parent.review = self.request
-        uow.register(RecordCommitOp(draft.parent))
-        # update draft to reflect the new status
-        uow.register(RecordIndexOp(draft, indexer=service.indexer))
+        # commit the parent and update draft to reflect the new status
+        uow.register(ParentCommitDraftIndexOp(draft, indexer=service.indexer))
 
 
 #
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Unit of work operations for review requests."""
+
+from invenio_records_resources.services.uow import Operation
+
+
+class ParentCommitDraftIndexOp(Operation):
+    """Commit a draft's parent and reindex the draft.
+
+    Replaces registering a ``RecordCommitOp`` for the parent followed by a
+    ``RecordIndexOp`` for the draft when a review changes state.
+    """
+
+    def __init__(self, draft, indexer):
+        """Initialize the parent commit and draft index operation."""
+        super().__init__()
+        self._draft = draft
+        self._indexer = indexer
+
+    def on_register(self, uow):
+        """Commit the parent (will flush to the database)."""
+        self._draft.parent.commit()
+
+    def on_commit(self, uow):
+        """Reindex the draft to reflect the new review status."""
+        self._indexer.index(self._draft)
@@ -9,6 +9,7 @@
 """High-level API for working with RDM service components."""
 
 from .access import AccessComponent
+from .file_exploration import FileExplorationComponent
 from .metadata import MetadataComponent
 from .parent import ParentRecordAccessComponent
 from .pids import PIDsComponent
@@ -16,6 +17,7 @@ from .review import ReviewComponent
 
 __all__ = (
     "AccessComponent",
+    "FileExplorationComponent",
     "MetadataComponent",
     "ParentRecordAccessComponent",
     "PIDsComponent",
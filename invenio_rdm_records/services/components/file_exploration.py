@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""RDM service component for the MSD-LIVE file exploration metadata."""
+
+import threading
+
+import requests
+from cachetools import TTLCache
+from invenio_drafts_resources.services.records.components import ServiceComponent
+from marshmallow import ValidationError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# keep-alive session shared by all checks so probing the github url does not
+# open a new TCP/TLS connection every time
+_http_session = requests.Session()
+_http_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(total=1, backoff_factor=0.1),
+    ),
+)
+# (connect, read) timeout in seconds for the github url check
+_HTTP_TIMEOUT = (2, 3)
+# urls that answered recently, so saving the same record again skips the check;
+# failures are not cached so a repo that was just made public is accepted right away
+_reachable_urls = TTLCache(maxsize=2048, ttl=300)
+_reachable_urls_lock = threading.Lock()
+
+
+def is_reachable_url(url):
+    """Returns if a HEAD request to the url answers with a 2xx status.
+
+    Bounded by _HTTP_TIMEOUT, connection errors and timeouts count as unreachable.
+    Positive answers are cached for five minutes.
+    """
+    url = url.strip()
+    with _reachable_urls_lock:
+        if url in _reachable_urls:
+            return True
+    try:
+        response = _http_session.head(url, allow_redirects=False, timeout=_HTTP_TIMEOUT)
+    except requests.exceptions.RequestException:
+        return False
+    if not 200 <= response.status_code < 300:
+        return False
+    with _reachable_urls_lock:
+        _reachable_urls[url] = True
+    return True
+
+
+GITHUB_URL_ERROR = (
+    "Invalid github url. Please make sure the url is correct and the repo is public."
+)
+
+
+def has_unreachable_github_url(metadata):
+    """Returns if exploration is enabled with a github url that can't be reached."""
+    exploration = (metadata or {}).get("msdlive_file_exploration") or {}
+    github_url = exploration.get("github_url")
+    return (
+        exploration.get("status") == "enabled"
+        and bool(github_url)
+        and not is_reachable_url(github_url)
+    )
+
+
+def validate_github_url(metadata):
+    """Raises a ValidationError if the file exploration github url can't be reached.
+
+    Used when a draft is published and when it is submitted for review.
+    """
+    if has_unreachable_github_url(metadata):
+        raise ValidationError(
+            {
+                "metadata": {
+                    "msdlive_file_exploration": {"github_url": [GITHUB_URL_ERROR]}
+                }
+            }
+        )
+
+
+class FileExplorationComponent(ServiceComponent):
+    """Service component checking the file exploration github url.
+
+    The url is probed when a draft is saved or published rather than in the
+    metadata schema, which is also used to read, serialize and reindex records.
+    Submitting a draft for review runs the same check (see
+    ``requests.community_submission.SubmitAction``).
+    """
+
+    error_message = GITHUB_URL_ERROR
+
+    def _report(self, data, errors):
+        """Report an unreachable github url with the draft's validation errors."""
+        if errors is not None and has_unreachable_github_url(data.get("metadata")):
+            errors.append(
+                {
+                    "field": "metadata.msdlive_file_exploration.github_url",
+                    "messages": [self.error_message],
+                }
+            )
+
+    def create(self, identity, data=None, record=None, errors=None, **kwargs):
+        """Check the github url of a new draft."""
+        self._report(data, errors)
+
+    def update_draft(self, identity, data=None, record=None, errors=None, **kwargs):
+        """Check the github url of an updated draft."""
+        self._report(data, errors)
+
+    def publish(self, identity, draft=None, record=None, **kwargs):
+        """Block publishing with an unreachable github url."""
+        validate_github_url(draft.get("metadata"))
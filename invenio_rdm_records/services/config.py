@@ -40,6 +40,7 @@ from ..records import RDMDraft, RDMRecord
 from . import facets
 from .components import (
     AccessComponent,
+    FileExplorationComponent,
     MetadataComponent,
     PIDsComponent,
     ReviewComponent,
@@ -148,6 +149,8 @@ class RDMRecordServiceConfig(RecordServiceConfig, ConfiguratorMixin):
     # Components - order matters!
     components = [
         MetadataComponent,
+        # MSD-LIVE CHANGE checks the file exploration github url on save/publish
+        FileExplorationComponent,
         AccessComponent,
         DraftFilesComponent,
         # for the internal `pid` field
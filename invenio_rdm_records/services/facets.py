@@ -9,6 +9,8 @@
 
 """Facet definitions."""
 
+from types import MappingProxyType
+
 from flask_babelex import gettext as _
 from invenio_records_resources.services.records.facets import (
     NestedTermsFacet,
@@ -23,19 +25,21 @@ from ..records.systemfields.access.field.record import AccessStatusEnum
 access_status = TermsFacet(
     field="access.status",
     label=_("Access Status"),
-    value_labels={
-        AccessStatusEnum.OPEN.value: _("Open"),
-        AccessStatusEnum.EMBARGOED.value: _("Embargoed"),
-        AccessStatusEnum.RESTRICTED.value: _("Restricted"),
-        AccessStatusEnum.METADATA_ONLY.value: _("Metadata-only"),
-    },
+    value_labels=MappingProxyType(
+        {
+            AccessStatusEnum.OPEN.value: _("Open"),
+            AccessStatusEnum.EMBARGOED.value: _("Embargoed"),
+            AccessStatusEnum.RESTRICTED.value: _("Restricted"),
+            AccessStatusEnum.METADATA_ONLY.value: _("Metadata-only"),
+        }
+    ),
 )
 
 
 is_published = TermsFacet(
     field="is_published",
     label=_("Status"),
-    value_labels={"true": _("Published"), "false": _("Unpublished")},
+    value_labels=MappingProxyType({"true": _("Published"), "false": _("Unpublished")}),
 )
 
 
@@ -106,10 +110,10 @@ msdlive_model = TermsFacet(
 file_status = TermsFacet(
     field='metadata.msdlive_file_location.location_type.keyword',
     label='File Status',
-    value_labels={
+    value_labels=MappingProxyType({
         'local': 'In MSD-LIVE',
         'external': 'Metadata-only',
-    },
+    }),
 )
 
 #
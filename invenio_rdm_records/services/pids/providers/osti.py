@@ -6,17 +6,66 @@
 # it under the terms of the MIT License; see LICENSE file for more details.
 
 """DataCite DOI Provider."""
-import json
+import html
+import re
 import warnings
+from collections import namedtuple
+
 import ostiapi
+import requests
 from flask import current_app
+from invenio_pidstore.models import PIDStatus
 from invenio_records_resources.services.uow import RecordCommitOp, unit_of_work
-from marshmallow_utils.html import strip_html
 
 from invenio_rdm_records.resources.serializers import OSTIJSONSerializer
-from invenio_pidstore.models import PIDStatus
+
 from .base import PIDProvider
 
+# descriptions are stored as sanitized HTML, so tags are well formed and a plain
+# tag regex is enough to turn them into the plain text abstract OSTI expects
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# example OSTI document, the nested authors list is shared between the copies
+# handed out by OSTIPIDProvider._get_dummy_metadata so it must not be mutated
+_DUMMY_METADATA = {
+    "title": "My upcoming dataset",
+    "dataset_type": "IP",
+    "site_url": "https://sbrsfa.velo.pnnl.gov/datasets/?UUID=d2f86d79-d582-4dea-929b-eefe4ab34052#metadata2",
+    "publication_date": "06/01/2022",
+    "authors": [
+        {
+            "first_name": "Neal",
+            "last_name": "Ensor",
+            "affiliation_name": "DOE OSTI",
+            "private_email": "ensorn@osti.gov",
+            "orcid_id": "0000-0001-5166-5705",
+        }
+    ],
+}
+
+OSTIConfig = namedtuple(
+    "OSTIConfig",
+    ["username", "password", "accession_number_prefix", "contract_nos", "sponsor_org"],
+)
+
+
+def _osti_cfg(app, config_prefix):
+    """Resolve the OSTI configuration values of an application once.
+
+    The resolved values are kept in ``app.extensions`` so they live as long as the
+    application. OSTI_* config is read-only once the first DOI call was made: changes
+    to app.config after that need ``app.extensions.pop("osti-config")`` to be seen.
+    """
+    resolved = app.extensions.setdefault("osti-config", {})
+    if config_prefix not in resolved:
+        resolved[config_prefix] = OSTIConfig(
+            *(
+                app.config.get(f"{config_prefix}_{field.upper()}")
+                for field in OSTIConfig._fields
+            )
+        )
+    return resolved[config_prefix]
+
 
 class OSTIClient:
     """OSTI Client."""
@@ -112,6 +161,23 @@ class OSTIPIDProvider(PIDProvider):
         """Get a application config value."""
         return current_app.config.get(self.cfgkey(key), default)
 
+    @property
+    def config(self):
+        """Resolved OSTI configuration of the current application."""
+        return _osti_cfg(current_app._get_current_object(), self._config_prefix)
+
+    def _record_fields(self, record):
+        """OSTI fields identifying the record and its funding, sent on every call.
+
+        The accession_num combines the configured accession number prefix with the record's
+        pid so it uniquely identifies the record both in OSTI and in our system.
+        """
+        config = self.config
+        return {
+            "accession_num": f"{config.accession_number_prefix}-{record.pid.pid_value}",
+            "contract_nos": str(config.contract_nos),
+            "sponsor_org": str(config.sponsor_org),
+        }
 
     def generate_id(self, record, **kwargs):
         """Generate a unique DOI."""
@@ -122,25 +188,20 @@ class OSTIPIDProvider(PIDProvider):
         # record in OSTI (like when it's published or when we need to update the metadata) so in order for accession_num
         # to uniquely identify the record in OSTI and in our system we combine record.pid.pid_value with the accession_number_prefix
         try:
-            prefix = self.cfg('accession_number_prefix')
-            username = self.cfg('username')
-            password = self.cfg('password')
+            config = self.config
             # do NOT run the serializer dump_one as it will also validate the record and records do not need to have all required
             # fields entered before reserving a DOI (the dump_one code will throw an exception if the record isn't valid)
             # doc = self.serializer.dump_one(record)
+            metadata = record.get('metadata') or {}
             doc = {
-                "title": "Placeholder Title"
+                "title": metadata.get('title') or "Placeholder Title",
+                **self._record_fields(record),
             }
-            if record.get('metadata').get('title'):
-                doc['title']=record.get('metadata').get('title')
-            doc['accession_num'] = f"{prefix}-{record.pid.pid_value}"
-            doc['contract_nos'] = f"{self.cfg('contract_nos')}"
-            doc['sponsor_org'] = f"{self.cfg('sponsor_org')}"
-            current_app.logger.info("doc being sent to OSTI: " f"{doc}")
+            current_app.logger.info("doc being sent to OSTI: %s", doc)
             osti_record = self.client.api.reserve(
                 doc,
-                username, password)
-            current_app.logger.info("osti record returned from reserve" f"{osti_record}")
+                config.username, config.password)
+            current_app.logger.info("osti record returned from reserve: %s", osti_record)
             error = self.parse_osti_error(osti_record)
             if error:
                 current_app.logger.error("OSTI returned ERROR status with message " f"{error}" " " f"full record: {osti_record}")
@@ -177,30 +238,36 @@ class OSTIPIDProvider(PIDProvider):
 
         try:
             doc = self._corrected_dump_one(record)
-            username = self.cfg('username')
-            password = self.cfg('password')
-            prefix = self.cfg('accession_number_prefix')
+            config = self.config
 
             # first generate the accession_num (A site-specified unique identifier to optionally identify the record) for this record
             # in the same way as was done in the generate_id method above and add it to the doc that the serializer returns
             # we need to pass this so OSTI will mint the already created DOI instead of generating a new one
             # always generate and send the accession_num to use with future calls to OSTI's api for this record (i.e. to mint or update an already minted):
-            doc['accession_num'] = f"{prefix}-{record.pid.pid_value}"
-            doc['contract_nos'] = f"{self.cfg('contract_nos')}"
-            doc['sponsor_org'] = f"{self.cfg('sponsor_org')}"
+            doc.update(self._record_fields(record))
             doc['site_url'] = url
 
-            current_app.logger.debug("doc sent to OSTI " f"{doc}")
+            current_app.logger.debug("doc sent to OSTI: %s", doc)
 
-            osti_record = self.client.api.post(doc, username, password)
+            osti_record = self.client.api.post(doc, config.username, config.password)
             error = self.parse_osti_error(osti_record)
             if error:
                 self.persist_minting_error(record, error)
                 current_app.logger.error(f"OSTI returned ERROR status with message: {error}, OSTI record returned: {osti_record}")
                 return False
 
-            current_app.logger.debug("osti DOI minted and returned " f"{osti_record}")
+            current_app.logger.debug("osti DOI minted and returned: %s", osti_record)
             return True
+        except (requests.ConnectionError, requests.Timeout) as e:
+            # OSTI could not be reached: keep the error visible on the record but let the
+            # register_or_update_pid task retry. persist_minting_error runs in its own unit of
+            # work whose commit also commits the session, including the local pid.register()
+            # above, before the re-raise rolls back the task's unit of work. The PID therefore
+            # stays REGISTERED and the retry goes through update(), which re-sends the same
+            # accession_num and clears the minting error. Keep this ordering if this changes.
+            self.persist_minting_error(record, str(e))
+            current_app.logger.warning(f"OSTI unreachable when registering DOI for {pid.pid_value}, retrying")
+            raise
         except Exception as e:
             self.persist_minting_error(record, str(e))
             current_app.logger.error(f"OSTI provider error when registering DOI for {pid.pid_value}", exc_info=True)
@@ -208,7 +275,10 @@ class OSTIPIDProvider(PIDProvider):
 
     @unit_of_work()
     def persist_minting_error(self, record, error, uow=None):
-        record.get('metadata').update({'msdlive_doi_minting_error': error})
+        if error is None:
+            record.get('metadata').pop('msdlive_doi_minting_error', None)
+        else:
+            record.get('metadata').update({'msdlive_doi_minting_error': error})
         uow.register(RecordCommitOp(record))
 
     def update(self, pid, record=None, **kwargs):
@@ -225,24 +295,27 @@ class OSTIPIDProvider(PIDProvider):
         # button is clicked on the new version's draft in the UI and only THEN is this update method is called.
         try:
             # Set metadata
-            prefix = self.cfg('accession_number_prefix')
-            username = self.cfg('username')
-            password = self.cfg('password')
+            config = self.config
             doc = self._corrected_dump_one(record)
-            doc['contract_nos'] = f"{self.cfg('contract_nos')}"
-            doc['sponsor_org'] = f"{self.cfg('sponsor_org')}"
-            doc['accession_num'] = f"{prefix}-{record.pid.pid_value}"
+            doc.update(self._record_fields(record))
             doc['site_url'] = kwargs.get('url')
 
-            current_app.logger.info("doc sent to OSTI " f"{doc}")
-            osti_record = self.client.api.post(doc, username, password)
+            current_app.logger.info("doc sent to OSTI: %s", doc)
+            osti_record = self.client.api.post(doc, config.username, config.password)
             error = self.parse_osti_error(osti_record)
             if error:
                 current_app.logger.error("OSTI returned ERROR status with message " f"{error}" " " f"full record: {osti_record}")
                 return False
 
-            current_app.logger.info("osti record returned from reserve" f"{json.dumps(osti_record)}")
+            # a previous registration attempt may have failed before this (retried) update
+            if record.get('metadata', {}).get('msdlive_doi_minting_error'):
+                self.persist_minting_error(record, None)
+
+            current_app.logger.debug("osti record returned from update: %s", osti_record)
             return True
+        except (requests.ConnectionError, requests.Timeout):
+            current_app.logger.warning(f"OSTI unreachable when updating DOI for {pid.pid_value}, retrying")
+            raise
         except Exception as e:
             current_app.logger.error("DataCite provider error when "
                                        f"updating DOI for {pid.pid_value}")
@@ -329,42 +402,34 @@ class OSTIPIDProvider(PIDProvider):
         :return:
         -------------------------------------------------------------------------------------------------------------"""
         doc = self.serializer.dump_one(record)
-        metadata = record.get('metadata')
-
-        # First see if the record has an abstract.  If it does, use that for the description.
-        abstract = None
-        additional_descriptions = metadata.get('additional_descriptions', [])
-        for desc in additional_descriptions:
-            type = desc.get('type', {}).get('id')
-            if type == 'abstract':
-                abstract = desc.get('description')
-
-        abstract = metadata.get('description') if not abstract else abstract
-
-        # Strip off html tags
-        if abstract:
-            abstract = strip_html(abstract)
-            # OSTI will throw an error if abstract is longer than 12000 characters
-            abstract = abstract[:12000]
-            doc['description'] = abstract
+        metadata = record.get('metadata') or {}
+        additional_descriptions = metadata.get('additional_descriptions')
+        description = metadata.get('description')
+
+        # nothing to correct when the record has no descriptions at all
+        if additional_descriptions or description:
+            # First see if the record has an abstract.  If it does, use that for the description.
+            abstract = next(
+                (
+                    desc.get('description')
+                    for desc in additional_descriptions or []
+                    if (desc.get('type') or {}).get('id') == 'abstract'
+                ),
+                None,
+            ) or description
+
+            # Strip off html tags
+            if abstract:
+                abstract = html.unescape(_TAG_RE.sub("", abstract)).strip()
+                # OSTI will throw an error if abstract is longer than 12000 characters
+                abstract = abstract[:12000]
+                doc['description'] = abstract
 
         return doc
 
     def _get_dummy_metadata(self, contract_nos, sponsor_org):
         return {
-              "title": "My upcoming dataset",
-              "dataset_type": "IP",
-              "contract_nos": f"{contract_nos}",
-              "sponsor_org": f"{sponsor_org}",
-              "site_url": "https://sbrsfa.velo.pnnl.gov/datasets/?UUID=d2f86d79-d582-4dea-929b-eefe4ab34052#metadata2",
-              "publication_date": "06/01/2022",
-              "authors": [
-                {
-                  "first_name": "Neal",
-                  "last_name": "Ensor",
-                  "affiliation_name": "DOE OSTI",
-                  "private_email": "ensorn@osti.gov",
-                  "orcid_id": "0000-0001-5166-5705"
-                }
-              ]
-            }
+            **_DUMMY_METADATA,
+            "contract_nos": str(contract_nos),
+            "sponsor_org": str(sponsor_org),
+        }
@@ -7,13 +7,20 @@
 
 """RDM PIDs Service tasks."""
 
+import requests
 from celery import shared_task
 from invenio_access.permissions import system_identity
 
 from invenio_rdm_records.proxies import current_rdm_records
 
 
-@shared_task(ignore_result=True)
+@shared_task(
+    ignore_result=True,
+    acks_late=True,
+    autoretry_for=(requests.ConnectionError, requests.Timeout),
+    retry_backoff=True,
+    max_retries=5,
+)
 def register_or_update_pid(recid, scheme):
     """Update a PID on the remote provider."""
     current_rdm_records.records_service.pids.register_or_update(
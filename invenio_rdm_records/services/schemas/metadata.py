@@ -11,8 +11,7 @@
 
 """RDM record schemas."""
 
-from functools import partial
-from urllib import parse
+from collections import deque
 
 from flask import current_app
 from flask_babelex import lazy_gettext as _
@@ -37,8 +36,6 @@ from marshmallow_utils.fields import (
 )
 from marshmallow_utils.schemas import GeometryObjectSchema, IdentifierSchema
 from werkzeug.local import LocalProxy
-# MSD-LIVE CHANGE adding requests to validate github url
-import requests
 
 record_personorg_schemes = LocalProxy(
     lambda: current_app.config["RDM_RECORDS_PERSONORG_SCHEMES"]
@@ -60,24 +57,87 @@ record_location_schemes = LocalProxy(
 )
 
 
+def _identifier_schema(schemes, **kwargs):
+    """Returns an identifier schema factory for nested fields.
+
+    The schemes proxy is resolved once when the nested schema is created (i.e. per
+    schema instance), instead of through the proxy on every access while validating
+    each identifier.
+    """
+
+    def factory():
+        return IdentifierSchema(allowed_schemes=schemes._get_current_object(), **kwargs)
+
+    return factory
+
+
+def _one_of(choices, error_msg):
+    """Returns one-of field options whose required message mirrors the choice error.
+
+    The (already formatted) error message is shared by both instead of being
+    formatted twice per field.
+    """
+    return {
+        "validate": validate.OneOf(choices=choices, error=error_msg),
+        # [] needed to mirror error message above
+        "error_messages": {"required": [error_msg]},
+    }
+
+
 def _not_blank(error_msg):
     """Returns a non-blank validation rule with custom error message."""
     return validate.Length(min=1, error=error_msg)
 
 
+class _BoundedURL(validate.URL):
+    """URL validator that rejects overlong values before running the regex.
+
+    Keeps the cost of the URL pattern bounded regardless of the input size.
+    """
+
+    max_length = 2048
+
+    def __call__(self, value):
+        """Validate the length, then the URL structure."""
+        if value and len(value) > self.max_length:
+            raise ValidationError(self._format_error(value))
+        return super().__call__(value)
+
+
 def _valid_url(error_msg):
     """Returns a URL validation rule with custom error message."""
-    return validate.URL(error=error_msg)
+    return _BoundedURL(error=error_msg)
+
+
+# validators are stateless, so fields with the same rule share one instance
+_MIN_LENGTH_3 = validate.Length(min=3)
+_URL_VALIDATOR = _valid_url(_("Not a valid URL."))
+_NOT_BLANK_SIZE = _not_blank(_("Size cannot be a blank string."))
+_NOT_BLANK_FORMAT = _not_blank(_("Format cannot be a blank string."))
+
+
+def _valid_locale_codes(app):
+    """Returns the language codes of the app's configured locales.
+
+    Resolved once and kept in ``app.extensions``; the configured languages are
+    read-only once the first rights entry was validated.
+    """
+    codes = app.extensions.get("rdm-locale-codes")
+    if codes is None:
+        locales = app.extensions["invenio-i18n"].get_locales()
+        codes = app.extensions["rdm-locale-codes"] = frozenset(
+            v.language for v in locales
+        )
+    return codes
 
 
 def locale_validation(value, field_name):
     """Validates the locale value."""
-    valid_locales = current_app.extensions["invenio-i18n"].get_locales()
-    valid_locales_code = [v.language for v in valid_locales]
     if value:
-        if len(value.keys()) > 1:
+        if len(value) > 1:
             raise ValidationError(_("Only one value is accepted."), field_name)
-        elif list(value.keys())[0] not in valid_locales_code:
+        valid_locales_code = _valid_locale_codes(current_app._get_current_object())
+        if next(iter(value)) not in valid_locales_code:
             raise ValidationError(_("Not a valid locale."), field_name)
 
 
@@ -88,59 +148,44 @@ class PersonOrOrganizationSchema(Schema):
 
     type = SanitizedUnicode(
         required=True,
-        validate=validate.OneOf(
-            choices=NAMES,
-            error=_("Invalid value. Choose one of {NAMES}.").format(NAMES=NAMES),
-        ),
-        error_messages={
-            # [] needed to mirror error message above
-            "required": [_("Invalid value. Choose one of {NAMES}.").format(NAMES=NAMES)]
-        },
+        **_one_of(NAMES, _("Invalid value. Choose one of {NAMES}.").format(NAMES=NAMES)),
     )
     name = SanitizedUnicode()
     given_name = SanitizedUnicode()
     family_name = SanitizedUnicode()
     identifiers = IdentifierSet(
         fields.Nested(
-            partial(
-                IdentifierSchema,
-                # It is intended to allow org schemes to be sent as personal
-                # and viceversa. This is a trade off learnt from running
-                # Zenodo in production.
-                allowed_schemes=record_personorg_schemes,
-            )
+            # It is intended to allow org schemes to be sent as personal
+            # and viceversa. This is a trade off learnt from running
+            # Zenodo in production.
+            _identifier_schema(record_personorg_schemes)
         )
     )
 
-    @validates_schema
-    def validate_names(self, data, **kwargs):
-        """Validate names based on type."""
-        if data["type"] == "personal":
-            if not data.get("family_name"):
+    @post_load
+    def update_names(self, data, **kwargs):
+        """Validate and update names for organization / person.
+
+        Require family_name and fill name from given_name and family_name if person.
+        Require name and remove given_name and family_name if organization.
+        """
+        type_ = data["type"]
+        if type_ == "personal":
+            family_name = data.get("family_name")
+            if not family_name:
                 messages = [_("Family name cannot be blank.")]
                 raise ValidationError({"family_name": messages})
+            given_name = data.get("given_name")
+            data["name"] = (
+                f"{family_name}, {given_name}" if given_name else family_name
+            )
 
-        elif data["type"] == "organizational":
+        elif type_ == "organizational":
             if not data.get("name"):
                 messages = [_("Name cannot be blank.")]
                 raise ValidationError({"name": messages})
-
-    @post_load
-    def update_names(self, data, **kwargs):
-        """Update names for organization / person.
-
-        Fill name from given_name and family_name if person.
-        Remove given_name and family_name if organization.
-        """
-        if data["type"] == "personal":
-            names = [data.get("family_name"), data.get("given_name")]
-            data["name"] = ", ".join([n for n in names if n])
-
-        elif data["type"] == "organizational":
-            if "family_name" in data:
-                del data["family_name"]
-            if "given_name" in data:
-                del data["given_name"]
+            data.pop("family_name", None)
+            data.pop("given_name", None)
 
         return data
 
@@ -175,7 +220,7 @@ class ContributorSchema(Schema):
 class TitleSchema(Schema):
     """Schema for the additional title."""
 
-    title = SanitizedUnicode(required=True, validate=validate.Length(min=3))
+    title = SanitizedUnicode(required=True, validate=_MIN_LENGTH_3)
     type = fields.Nested(VocabularySchema, required=True)
     lang = fields.Nested(VocabularySchema)
 
@@ -188,52 +233,32 @@ class FileExploration(Schema):
     
     @validates_schema
     def validate_kernel(self, data, **kwargs):
-        """Validates that kernel is selected if notebooks status is enabled and that github url is valid."""
+        """Validates that kernel is selected if notebooks status is enabled.
+
+        Whether the github url can be reached is checked by the FileExplorationComponent
+        when the record is saved or published, not on every load of the schema.
+        """
         status = data.get("status")
         kernel = data.get("kernel")
-        github_url = data.get("github_url")
         if status == "enabled":
             if kernel is None:
                 raise ValidationError(
                     "Kernel is required", field_name="kernel"
                 )
-            if github_url:
-                error_message = 'Invalid github url. Please make sure the url is correct and the repo is public.'
-                try:
-                    response = requests.head(github_url)
-                    if not 200 <= response.status_code < 300:
-                        raise ValidationError(error_message, field_name="github_url")
-                except requests.exceptions.RequestException:
-                    raise ValidationError(error_message, field_name="github_url")
-            
-        
+
     
     KERNELS = ["Python", "R", "Julia"]
     STATUS = ["enabled", "disabled"]
     
     # status = SanitizedUnicode(required=True,
     status = SanitizedUnicode(required=False,
-        validate=validate.OneOf(
-            choices=STATUS,
-            error=_("Invalid value. Choose one of {STATUS}.").format(STATUS=STATUS),
-        ),
-        error_messages={
-            # [] needed to mirror error message above
-            "required": [_("Invalid value. Choose one of {KERNELS}.").format(KERNELS=KERNELS)]
-        },
+        **_one_of(STATUS, _("Invalid value. Choose one of {STATUS}.").format(STATUS=STATUS)),
     )
     
     kernel = SanitizedUnicode(required=False,
-        validate=validate.OneOf(
-            choices=KERNELS,
-            error=_("Invalid value. Choose one of {KERNELS}.").format(KERNELS=KERNELS),
-        ),
-        error_messages={
-            # [] needed to mirror error message above
-            "required": [_("Invalid value. Choose one of {KERNELS}.").format(KERNELS=KERNELS)]
-        },
+        **_one_of(KERNELS, _("Invalid value. Choose one of {KERNELS}.").format(KERNELS=KERNELS)),
     )
-    github_url = SanitizedUnicode(required=False, validate=_valid_url(_("Not a valid URL.")))
+    github_url = SanitizedUnicode(required=False, validate=_URL_VALIDATOR)
     
     
 class SectorSchema(Schema):
@@ -282,18 +307,11 @@ class FileLocationSchema(Schema):
     """Schema for the MSD-LIVE File Location"""
     TYPES = ["local", "external"]
 
-    external_description = SanitizedHTML(required=False, validate=validate.Length(min=3))
+    external_description = SanitizedHTML(required=False, validate=_MIN_LENGTH_3)
     # location_type = SanitizedUnicode()
     location_type = SanitizedUnicode(
         required=True,
-        validate=validate.OneOf(
-            choices=TYPES,
-            error=_("Invalid value. Choose one of {TYPES}.").format(TYPES=TYPES),
-        ),
-        error_messages={
-            # [] needed to mirror error message above
-            "required": [_("Invalid value. Choose one of {TYPES}.").format(TYPES=TYPES)]
-        },
+        **_one_of(TYPES, _("Invalid value. Choose one of {TYPES}.").format(TYPES=TYPES)),
     )
 
 #
@@ -302,26 +320,29 @@ class FileLocationSchema(Schema):
 class DescriptionSchema(Schema):
     """Schema for the additional descriptions."""
 
-    description = SanitizedHTML(required=True, validate=validate.Length(min=3))
+    description = SanitizedHTML(required=True, validate=_MIN_LENGTH_3)
     type = fields.Nested(VocabularySchema, required=True)
     lang = fields.Nested(VocabularySchema)
 
 
 def _is_uri(uri):
-    try:
-        parse.urlparse(uri)
-        return True
-    except AttributeError:
-        return False
+    # urlparse only raised on non-string input, so check the type directly
+    return isinstance(uri, str)
 
 
 class PropsSchema(Schema):
     """Schema for the URL schema."""
 
-    url = SanitizedUnicode(validate=_valid_url(_("Not a valid URL.")))
+    url = SanitizedUnicode(validate=_URL_VALIDATOR)
     scheme = SanitizedUnicode()
 
 
+_RIGHTS_ID_XOR_TEXT_MSG = _(
+    "Only an existing id or free text title/description/link"
+    + " is accepted, but not both cases at the same time"
+)
+
+
 class RightsSchema(Schema):
     """License schema."""
 
@@ -330,7 +351,7 @@ class RightsSchema(Schema):
     description = fields.Dict()
     icon = fields.Str(dump_only=True)
     props = fields.Nested(PropsSchema)
-    link = SanitizedUnicode(validate=_valid_url(_("Not a valid URL.")))
+    link = SanitizedUnicode(validate=_URL_VALIDATOR)
 
     @validates("title")
     def validate_title(self, value):
@@ -352,14 +373,8 @@ class RightsSchema(Schema):
             raise ValidationError(
                 _("An existing id or a free text title must be present"), "rights"
             )
-        elif id_ and len(data.values()) > 1:
-            raise ValidationError(
-                _(
-                    "Only an existing id or free text title/description/link"
-                    + " is accepted, but not both cases at the same time"
-                ),
-                "rights",
-            )
+        elif id_ and data.keys() - {"id"}:
+            raise ValidationError(_RIGHTS_ID_XOR_TEXT_MSG, "rights")
 
 
 class DateSchema(Schema):
@@ -375,7 +390,9 @@ class RelatedIdentifierSchema(IdentifierSchema):
 
     def __init__(self, **kwargs):
         """Constructor."""
-        super().__init__(allowed_schemes=record_identifiers_schemes, **kwargs)
+        super().__init__(
+            allowed_schemes=record_identifiers_schemes._get_current_object(), **kwargs
+        )
 
     relation_type = fields.Nested(VocabularySchema)
     resource_type = fields.Nested(VocabularySchema)
@@ -406,7 +423,7 @@ class ReferenceSchema(IdentifierSchema):
     def __init__(self, **kwargs):
         """Constructor."""
         super().__init__(
-            allowed_schemes=record_references_schemes,
+            allowed_schemes=record_references_schemes._get_current_object(),
             identifier_required=False,
             **kwargs
         )
@@ -414,34 +431,22 @@ class ReferenceSchema(IdentifierSchema):
     reference = SanitizedUnicode(required=True)
 
 
-class PointSchema(Schema):
-    """Point schema."""
-
-    lat = fields.Number(required=True)
-    lon = fields.Number(required=True)
-
-
 class LocationSchema(Schema):
     """Location schema."""
 
+    KEYS = ("geometry", "place", "identifiers", "description")
+
     geometry = fields.Nested(GeometryObjectSchema)
     place = SanitizedUnicode()
     identifiers = fields.List(
-        fields.Nested(
-            partial(IdentifierSchema, allowed_schemes=record_location_schemes)
-        )
+        fields.Nested(_identifier_schema(record_location_schemes))
     )
     description = SanitizedUnicode()
 
     @validates_schema
     def validate_data(self, data, **kwargs):
         """Validate identifier based on type."""
-        if (
-            not data.get("geometry")
-            and not data.get("place")
-            and not data.get("identifiers")
-            and not data.get("description")
-        ):
+        if not any(data.get(key) for key in self.KEYS):
             raise ValidationError(
                 {
                     "locations": _(
@@ -452,6 +457,41 @@ class LocationSchema(Schema):
             )
 
 
+def _bounded_json_walk(value, max_nodes, max_depth):
+    """Validates that a JSON value stays within a node count and nesting depth.
+
+    Walks the value iteratively so deeply nested input can't hit the
+    recursion limit. Children are counted and the depth checked before they
+    are queued, so at most ``max_nodes`` nodes are ever held for the walk.
+    """
+    pending = deque([(value, 1)])
+    nodes = 1
+    while pending:
+        node, depth = pending.pop()
+        if isinstance(node, dict):
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        if not children:
+            continue
+        if depth >= max_depth:
+            raise ValidationError(
+                _("Too deeply nested (maximum depth {max_depth}).").format(
+                    max_depth=max_depth
+                )
+            )
+        nodes += len(children)
+        if nodes > max_nodes:
+            raise ValidationError(
+                _("Too many elements (maximum {max_nodes}).").format(
+                    max_nodes=max_nodes
+                )
+            )
+        pending.extend((child, depth + 1) for child in children)
+
+
 class FeatureSchema(Schema):
     """Location feature schema."""
 
@@ -461,6 +501,18 @@ class FeatureSchema(Schema):
     # features = fields.List(fields.Nested(LocationSchema))
     features = fields.Raw()
 
+    # detailed polygons are large: the "Contiguous United States" feature in
+    # tests/records/location-record.json alone has ~220k nodes (depth 7)
+    MAX_NODES = 2000000
+    MAX_DEPTH = 16
+
+    @validates("features")
+    def validate_features(self, value):
+        """Validates that features is a list of bounded size and depth."""
+        if not isinstance(value, list):
+            raise ValidationError(_("Features must be a list."))
+        _bounded_json_walk(value, self.MAX_NODES, self.MAX_DEPTH)
+
 
 class MetadataSchema(Schema):
     """Schema for the record metadata."""
@@ -480,7 +532,7 @@ class MetadataSchema(Schema):
     msdlive_scenarios = fields.List(fields.Nested(ScenarioSchema))
     msdlive_projects = fields.List(fields.Nested(ProjectSchema))
     msdlive_temporals = fields.List(fields.Nested(TemporalSchema))
-    msdlive_spatials = fields.List(fields.Nested(TemporalSchema))
+    msdlive_spatials = fields.List(fields.Nested(SpatialSchema))
     msdlive_models = fields.List(fields.Nested(ModelSchema))
     msdlive_file_location = fields.Nested(FileLocationSchema)
     msdlive_doi_minting_error = SanitizedUnicode()
@@ -491,7 +543,7 @@ class MetadataSchema(Schema):
     #
     # MSDLIVE CHANGE END
     #
-    title = SanitizedUnicode(required=True, validate=validate.Length(min=3))
+    title = SanitizedUnicode(required=True, validate=_MIN_LENGTH_3)
     additional_titles = fields.List(fields.Nested(TitleSchema))
     publisher = SanitizedUnicode()
     publication_date = EDTFDateString(required=True)
@@ -501,20 +553,14 @@ class MetadataSchema(Schema):
     languages = fields.List(fields.Nested(VocabularySchema))
     # alternate identifiers
     identifiers = IdentifierSet(
-        fields.Nested(
-            partial(IdentifierSchema, allowed_schemes=record_identifiers_schemes)
-        )
+        fields.Nested(_identifier_schema(record_identifiers_schemes))
     )
     related_identifiers = fields.List(fields.Nested(RelatedIdentifierSchema))
-    sizes = fields.List(
-        SanitizedUnicode(validate=_not_blank(_("Size cannot be a blank string.")))
-    )
-    formats = fields.List(
-        SanitizedUnicode(validate=_not_blank(_("Format cannot be a blank string.")))
-    )
+    sizes = fields.List(SanitizedUnicode(validate=_NOT_BLANK_SIZE))
+    formats = fields.List(SanitizedUnicode(validate=_NOT_BLANK_FORMAT))
 
     rights = fields.List(fields.Nested(RightsSchema))
-    description = SanitizedHTML(validate=validate.Length(min=3))
+    description = SanitizedHTML(validate=_MIN_LENGTH_3)
     additional_descriptions = fields.List(fields.Nested(DescriptionSchema))
     locations = fields.Nested(FeatureSchema)
     funding = fields.List(fields.Nested(FundingSchema))
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2022 CERN.
+#
+# Invenio-RDM-Records is free software; you can redistribute it and/or modify
+# it under the terms of the MIT License; see LICENSE file for more details.
+
+"""Tests for the service FileExploration component."""
+
+import pytest
+import requests
+from marshmallow import ValidationError
+
+from invenio_rdm_records.proxies import current_rdm_records
+from invenio_rdm_records.services.components import (
+    FileExplorationComponent,
+    file_exploration,
+)
+from invenio_rdm_records.services.components.file_exploration import (
+    is_reachable_url,
+    validate_github_url,
+)
+
+GITHUB_URL = "https://github.com/MSD-LIVE/notebooks"
+
+
+def _data(status="enabled"):
+    return {
+        "metadata": {
+            "msdlive_file_exploration": {
+                "status": status,
+                "kernel": "Python",
+                "github_url": GITHUB_URL,
+            }
+        }
+    }
+
+
+def test_unreachable_url_reported_on_draft(app, identity_simple, mocker):
+    """An unreachable github url is reported but does not block saving."""
+    mocker.patch(
+        "invenio_rdm_records.services.components.file_exploration.is_reachable_url",
+        return_value=False,
+    )
+    component = FileExplorationComponent(current_rdm_records.records_service)
+
+    errors = []
+    component.update_draft(identity_simple, data=_data(), errors=errors)
+
+    assert errors == [
+        {
+            "field": "metadata.msdlive_file_exploration.github_url",
+            "messages": [FileExplorationComponent.error_message],
+        }
+    ]
+
+
+def test_url_not_checked_when_disabled(app, identity_simple, mocker):
+    """The github url is only probed when exploration is enabled."""
+    probe = mocker.patch(
+        "invenio_rdm_records.services.components.file_exploration.is_reachable_url",
+        return_value=False,
+    )
+    component = FileExplorationComponent(current_rdm_records.records_service)
+
+    errors = []
+    component.create(identity_simple, data=_data(status="disabled"), errors=errors)
+
+    assert errors == []
+    assert not probe.called
+
+
+def test_unreachable_url_blocks_publish(app, identity_simple, mocker):
+    """Publishing with an unreachable github url raises a validation error."""
+    mocker.patch(
+        "invenio_rdm_records.services.components.file_exploration.is_reachable_url",
+        return_value=False,
+    )
+    component = FileExplorationComponent(current_rdm_records.records_service)
+
+    with pytest.raises(ValidationError):
+        component.publish(identity_simple, draft=_data())
+
+
+def test_reachable_url_passes(app, identity_simple, mocker):
+    """A reachable github url adds no error and does not block publishing."""
+    mocker.patch(
+        "invenio_rdm_records.services.components.file_exploration.is_reachable_url",
+        return_value=True,
+    )
+    component = FileExplorationComponent(current_rdm_records.records_service)
+
+    errors = []
+    component.update_draft(identity_simple, data=_data(), errors=errors)
+    component.publish(identity_simple, draft=_data())
+
+    assert errors == []
+
+
+def test_unreachable_url_blocks_submit(mocker):
+    """The check used when submitting a draft for review raises."""
+    mocker.patch(
+        "invenio_rdm_records.services.components.file_exploration.is_reachable_url",
+        return_value=False,
+    )
+
+    with pytest.raises(ValidationError):
+        validate_github_url(_data()["metadata"])
+
+
+@pytest.fixture()
+def reachable_urls():
+    """Empty the cache of reachable urls before and after a test."""
+    file_exploration._reachable_urls.clear()
+    yield file_exploration._reachable_urls
+    file_exploration._reachable_urls.clear()
+
+
+@pytest.mark.parametrize(
+    "error", [requests.Timeout, requests.ConnectionError, requests.RequestException]
+)
+def test_is_reachable_url_request_error(reachable_urls, mocker, error):
+    """Timeouts and request errors count as unreachable."""
+    mocker.patch.object(file_exploration._http_session, "head", side_effect=error)
+
+    assert is_reachable_url(GITHUB_URL) is False
+    assert GITHUB_URL not in reachable_urls
+
+
+def test_is_reachable_url_error_status_not_cached(reachable_urls, mocker):
+    """A non-2xx answer is unreachable and probed again on the next check."""
+    head = mocker.patch.object(
+        file_exploration._http_session,
+        "head",
+        return_value=mocker.Mock(status_code=404),
+    )
+
+    assert is_reachable_url(GITHUB_URL) is False
+    assert is_reachable_url(GITHUB_URL) is False
+    assert head.call_count == 2
+
+
+def test_is_reachable_url_success_cached(reachable_urls, mocker):
+    """A 2xx answer is reachable and cached for the following checks."""
+    head = mocker.patch.object(
+        file_exploration._http_session,
+        "head",
+        return_value=mocker.Mock(status_code=200),
+    )
+
+    assert is_reachable_url(GITHUB_URL) is True
+    assert is_reachable_url(f" {GITHUB_URL} ") is True
+    assert head.call_count == 1
@@ -8,9 +8,12 @@
 
 """PID service tasks tests."""
 
+import pytest
+import requests
 from invenio_pidstore.models import PIDStatus
 
 from invenio_rdm_records.proxies import current_rdm_records
+from invenio_rdm_records.services.pids import providers
 from invenio_rdm_records.services.pids.tasks import register_or_update_pid
 
 
@@ -83,3 +86,70 @@ def test_update_pid(running_app, es_clear, minimal_record, mocker, superuser_ide
     assert mocked_update.called is False
     service.publish(superuser_identity, record_edited.id)
     assert mocked_update.called is True
+
+
+def test_register_osti_pid_retried_as_update(
+    running_app, es_clear, minimal_record, mocker, superuser_identity
+):
+    """An OSTI connection error leaves the PID registered for the retry."""
+    app = running_app.app
+    pids_config = app.config["RDM_PERSISTENT_IDENTIFIERS"]
+    osti_provider = providers.OSTIPIDProvider(
+        "osti", client=providers.OSTIClient("osti", config_prefix="OSTI")
+    )
+    mocker.patch.dict(
+        app.config,
+        {
+            "OSTI_ENABLED": True,
+            "RDM_PERSISTENT_IDENTIFIER_PROVIDERS": [
+                *app.config["RDM_PERSISTENT_IDENTIFIER_PROVIDERS"],
+                osti_provider,
+            ],
+            "RDM_PERSISTENT_IDENTIFIERS": {
+                **pids_config,
+                "doi": {
+                    **pids_config["doi"],
+                    "providers": [*pids_config["doi"]["providers"], "osti"],
+                },
+            },
+        },
+    )
+    mocker.patch(
+        "invenio_rdm_records.services.pids.providers.osti."
+        + "OSTIPIDProvider._corrected_dump_one",
+        side_effect=lambda record: {"title": record.metadata["title"]},
+    )
+    mocked_post = mocker.patch(
+        "invenio_rdm_records.services.pids.providers.osti.ostiapi.post"
+    )
+    mocked_update = mocker.spy(providers.OSTIPIDProvider, "update")
+
+    service = current_rdm_records.records_service
+    draft = service.create(superuser_identity, minimal_record)
+    pid = osti_provider.create(draft._record, pid_value="10.11578/1234567")
+    pid.reserve()
+    record = service.record_cls.publish(draft._record)
+    record.pids = {pid.pid_type: {"identifier": pid.pid_value, "provider": "osti"}}
+    record.metadata = draft["metadata"]
+    record.register()
+    record.commit()
+
+    # OSTI can't be reached: the task raises so celery retries it, but the
+    # minting error and the locally registered PID are already committed
+    mocked_post.side_effect = requests.ConnectionError("OSTI is down")
+    with pytest.raises(requests.ConnectionError):
+        register_or_update_pid(recid=record["id"], scheme="doi")
+
+    assert osti_provider.get(pid.pid_value).status == PIDStatus.REGISTERED
+    record = service.record_cls.pid.resolve(record["id"])
+    assert record.metadata["msdlive_doi_minting_error"] == "OSTI is down"
+    assert mocked_update.called is False
+
+    # the retry updates the already registered DOI and clears the error
+    mocked_post.side_effect = None
+    mocked_post.return_value = {"status": "SUCCESS"}
+    register_or_update_pid(recid=record["id"], scheme="doi")
+
+    assert mocked_update.called is True
+    record = service.record_cls.pid.resolve(record["id"])
+    assert "msdlive_doi_minting_error" not in record.metadata
@@ -7,10 +7,17 @@
 
 """Test location schema."""
 
+import json
+from pathlib import Path
+
 import pytest
 from marshmallow import ValidationError
 
-from invenio_rdm_records.services.schemas.metadata import LocationSchema, MetadataSchema
+from invenio_rdm_records.services.schemas.metadata import (
+    FeatureSchema,
+    LocationSchema,
+    MetadataSchema,
+)
 
 
 @pytest.fixture(scope="function")
@@ -88,3 +95,28 @@ def test_invalid_no_list_location(app, minimal_record, valid_full_location):
 
     with pytest.raises(ValidationError):
         data = MetadataSchema().load(metadata)
+
+
+def test_valid_large_features(app):
+    """The repo's sample record with a detailed polygon loads."""
+    sample = Path(__file__).parents[2] / "records" / "location-record.json"
+    metadata = json.loads(sample.read_text())["metadata"]
+
+    data = MetadataSchema().load(metadata)
+    assert data["locations"] == metadata["locations"]
+
+
+def test_invalid_too_many_features(app):
+    features = [0] * (FeatureSchema.MAX_NODES + 1)
+
+    with pytest.raises(ValidationError):
+        FeatureSchema().load({"features": features})
+
+
+def test_invalid_too_deep_features(app):
+    features = []
+    for _ in range(FeatureSchema.MAX_DEPTH):
+        features = [features]
+
+    with pytest.raises(ValidationError):
+        FeatureSchema().load({"features": features})
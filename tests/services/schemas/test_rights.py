@@ -14,6 +14,8 @@ from marshmallow import ValidationError
 
 from invenio_rdm_records.services.schemas.metadata import MetadataSchema, RightsSchema
 
+from .test_utils import assert_raises_messages
+
 
 def test_valid_full_free_text(running_app):
     valid_full = {
@@ -60,6 +62,17 @@ def test_invalid_url(running_app):
         RightsSchema().load(invalid_url)
 
 
+def test_invalid_overlong_url(running_app):
+    invalid_url = {
+        "title": {"en": "Creative Commons Attribution 4.0 International"},
+        "link": "https://creativecommons.org/" + "a" * 2048,
+    }
+    assert_raises_messages(
+        lambda: RightsSchema().load(invalid_url),
+        {"link": ["Not a valid URL."]},
+    )
+
+
 def test_invalid_title(running_app):
     invalid_url = {
         "title": {"ena": "Creative Commons Attribution 4.0 International"},